@@ -8,6 +8,64 @@ from calendar_api import CalendarAPI
 from models.llm_client import create_llm_client
 
 
+# 日期匹配正则，模块加载时编译一次
+_DATE_LOOSE = re.compile(r"(\d{4})[年\-/](\d{1,2})[月\-/](\d{1,2})[日]?")
+_RELATIVE = re.compile(r"今[天日]|明[天日]|后[天日]|昨[天日]")
+# 相对日期匹配结果首字 -> 规范日期词
+_RELATIVE_LABELS = {"今": "今天", "明": "明天", "后": "后天", "昨": "昨天"}
+# 时辰相关关键词
+_HOUR_RE = re.compile(r"时辰|几点|什么时候|时间|小时")
+
+# 日黄历格式化表：(行模板, 条件字段)，条件字段为None表示总是输出，否则该字段为空时跳过该行
+_DAY_FIELDS = (
+    # 基本信息
+    ("日期：{ynian}年{yyue}月{yri}日", None),
+    ("星期：{xingqi}", None),
+    ("农历：{nnian}年{nyue}月{nri}", None),
+    ("节气：{jieqi}（{JIEQIDAYS}天）", None),
+    # 干支信息
+    ("年干支：{ganzhinian}", None),
+    ("月干支：{ganzhiyue}", None),
+    ("日干支：{ganzhiri}", None),
+    # 五行信息
+    ("年五行：{nianwuxing}", None),
+    ("月五行：{yuewuxing}", None),
+    ("日五行：{riwuxing}", None),
+    ("正五行：{ZHENG}", None),
+    # 宜忌信息
+    ("今日适宜：{yi}", "yi"),
+    ("今日不宜：{ji}", "ji"),
+    # 方位信息
+    ("财神方位：{DAYPOSITIONCAI}", None),
+    ("喜神方位：{DAYPOSITIONXI}", None),
+    ("福神方位：{DAYPOSITIONFU}", None),
+    # 冲煞信息
+    ("冲煞：{xiangchong}", "xiangchong"),
+    # 吉神凶煞
+    ("吉神：{DAYJISHEN}", "DAYJISHEN"),
+    ("凶煞：{DAYXIONGSHA}", "DAYXIONGSHA"),
+    # 黄道吉日信息
+    ("天德：{DAYTIANSHEN}（{DAYTIANSHENTYPE}，{DAYTIANSHENLUCK}）", "DAYTIANSHEN"),
+    # 值星信息
+    ("值星：{ZHIXING}", "ZHIXING"),
+    # 彭祖百忌
+    ("彭祖百忌：{pengzu}", "pengzu"),
+)
+
+# 12时辰的字段名：{时辰前缀}{0-5}，预先生成避免每次调用重复拼接
+_SHICHEN_KEYS = [
+    (f"{sc}0", f"{sc}1", f"{sc}2", f"{sc}3", f"{sc}4", f"{sc}5")
+    for sc in ("zi", "chou", "yin", "mao", "chen", "si", "wu", "wei", "shen", "you", "xu", "hai")
+]
+
+
+class _EmptyDefaultDict(dict):
+    """缺失字段按空字符串处理，供str.format_map使用"""
+    
+    def __missing__(self, key):
+        return ""
+
+
 class CalendarAgent:
     """黄历AI Agent，使用大模型理解黄历信息"""
     
@@ -37,23 +95,15 @@ class CalendarAgent:
         Returns:
             tuple: (year, month, day, date_str)
         """
-        # 匹配日期关键词
-        date_patterns = {
-            r"今天|今日": "今天",
-            r"明天|明日": "明天",
-            r"后天|后日": "后天",
-            r"昨天|昨日": "昨天",
-            r"(\d{4})[年\-/](\d{1,2})[月\-/](\d{1,2})[日]?": None  # 具体日期
-        }
-        
         # 检查相对日期
-        for pattern, date_str in date_patterns.items():
-            if date_str and re.search(pattern, question):
-                year, month, day = self.api.parse_date_string(date_str)
-                return year, month, day, date_str
+        relative_match = _RELATIVE.search(question)
+        if relative_match:
+            date_str = _RELATIVE_LABELS[relative_match.group()[0]]
+            year, month, day = self.api.parse_date_string(date_str)
+            return year, month, day, date_str
         
         # 检查具体日期
-        date_match = re.search(r"(\d{4})[年\-/](\d{1,2})[月\-/](\d{1,2})[日]?", question)
+        date_match = _DATE_LOOSE.search(question)
         if date_match:
             year = int(date_match.group(1))
             month = int(date_match.group(2))
@@ -75,81 +125,26 @@ class CalendarAgent:
         Returns:
             str: 格式化后的黄历信息文本
         """
-        info_parts = []
-        
-        # 基本信息
-        info_parts.append(f"日期：{day_info.get('ynian', '')}年{day_info.get('yyue', '')}月{day_info.get('yri', '')}日")
-        info_parts.append(f"星期：{day_info.get('xingqi', '')}")
-        info_parts.append(f"农历：{day_info.get('nnian', '')}年{day_info.get('nyue', '')}月{day_info.get('nri', '')}")
-        info_parts.append(f"节气：{day_info.get('jieqi', '')}（{day_info.get('JIEQIDAYS', '')}天）")
-        
-        # 干支信息
-        info_parts.append(f"年干支：{day_info.get('ganzhinian', '')}")
-        info_parts.append(f"月干支：{day_info.get('ganzhiyue', '')}")
-        info_parts.append(f"日干支：{day_info.get('ganzhiri', '')}")
-        
-        # 五行信息
-        info_parts.append(f"年五行：{day_info.get('nianwuxing', '')}")
-        info_parts.append(f"月五行：{day_info.get('yuewuxing', '')}")
-        info_parts.append(f"日五行：{day_info.get('riwuxing', '')}")
-        info_parts.append(f"正五行：{day_info.get('ZHENG', '')}")
-        
-        # 宜忌信息
-        yi = day_info.get("yi", "")
-        ji = day_info.get("ji", "")
-        if yi:
-            info_parts.append(f"今日适宜：{yi}")
-        if ji:
-            info_parts.append(f"今日不宜：{ji}")
-        
-        # 方位信息
-        info_parts.append(f"财神方位：{day_info.get('DAYPOSITIONCAI', '')}")
-        info_parts.append(f"喜神方位：{day_info.get('DAYPOSITIONXI', '')}")
-        info_parts.append(f"福神方位：{day_info.get('DAYPOSITIONFU', '')}")
-        
-        # 冲煞信息
-        xiangchong = day_info.get("xiangchong", "")
-        if xiangchong:
-            info_parts.append(f"冲煞：{xiangchong}")
-        
-        # 吉神凶煞
-        jishen = day_info.get("DAYJISHEN", "")
-        xiongsha = day_info.get("DAYXIONGSHA", "")
-        if jishen:
-            info_parts.append(f"吉神：{jishen}")
-        if xiongsha:
-            info_parts.append(f"凶煞：{xiongsha}")
-        
-        # 黄道吉日信息
-        tianshen = day_info.get("DAYTIANSHEN", "")
-        tianshen_type = day_info.get("DAYTIANSHENTYPE", "")
-        tianshen_luck = day_info.get("DAYTIANSHENLUCK", "")
-        if tianshen:
-            info_parts.append(f"天德：{tianshen}（{tianshen_type}，{tianshen_luck}）")
-        
-        # 值星信息
-        zhixing = day_info.get("ZHIXING", "")
-        if zhixing:
-            info_parts.append(f"值星：{zhixing}")
-        
-        # 彭祖百忌
-        pengzu = day_info.get("pengzu", "")
-        if pengzu:
-            info_parts.append(f"彭祖百忌：{pengzu}")
+        fields = _EmptyDefaultDict(day_info)
+        info_parts = [
+            template.format_map(fields)
+            for template, required_key in _DAY_FIELDS
+            if required_key is None or fields.get(required_key)
+        ]
         
         # 时辰信息
         if hour_info:
             info_parts.append("\n各时辰详情：")
-            shichen_list = ["zi", "chou", "yin", "mao", "chen", "si", "wu", "wei", "shen", "you", "xu", "hai"]
-            for sc in shichen_list:
-                sc_name = hour_info.get(f"{sc}0", "")
-                sc_luck = hour_info.get(f"{sc}1", "")
-                sc_time = hour_info.get(f"{sc}2", "")
-                sc_shen = hour_info.get(f"{sc}3", "")
-                sc_yi = hour_info.get(f"{sc}4", "")
-                sc_ji = hour_info.get(f"{sc}5", "")
-                
+            hour_get = hour_info.get
+            for k_name, k_luck, k_time, k_shen, k_yi, k_ji in _SHICHEN_KEYS:
+                sc_name = hour_get(k_name, "")
+                sc_luck = hour_get(k_luck, "")
+                # 名称或吉凶缺失的时辰直接跳过，不再查询其余字段
                 if sc_name and sc_luck:
+                    sc_time = hour_get(k_time, "")
+                    sc_shen = hour_get(k_shen, "")
+                    sc_yi = hour_get(k_yi, "")
+                    sc_ji = hour_get(k_ji, "")
                     hour_text = f"{sc_name}时（{sc_time}）：{sc_luck}"
                     if sc_shen:
                         hour_text += f"，{sc_shen}"
@@ -180,7 +175,7 @@ class CalendarAgent:
             hour_info = None
             
             # 如果问题涉及时辰，获取时辰信息
-            if any(keyword in question for keyword in ["时辰", "几点", "什么时候", "时间", "小时"]):
+            if _HOUR_RE.search(question):
                 hour_info = self.api.get_hour_calendar(year, month, day)
             
             # 格式化黄历信息
@@ -1,21 +1,41 @@
-import json
+import asyncio
+import datetime
+import functools
+import logging
 import os
 import re
+from typing import Dict, Iterator, List, Optional
+
+import orjson
 import yaml
 from jinja2 import Environment, FileSystemLoader
-from pkg.calender.calendar_api import CalendarAPI
+from agents.keywords import needs_force_refresh, needs_hour_info
+from pkg.calender.calendar_api import get_calendar_api
 from pkg.sqlite.sqlite import get_db
 from models.llm_client import create_llm_client
 from pkg.log.log import get_logger
 
 logger = get_logger()
 
+# 日期匹配正则，模块加载时编译一次，一次扫描同时匹配 YYYY-MM-DD 和 YYYY年M月D日 两种格式
+_DATE_ANY = re.compile(r"(\d{4})[-年](\d{1,2})[-月](\d{1,2})日?")
+
+# 回答问题使用的模型
+_ANSWER_MODEL = "deepseek-r1-250528"
+
+_NO_DATE_MESSAGE = "无法从问题中提取日期信息，请确保问题中包含具体日期（如2025-12-01）。"
+
+# 优先使用libyaml的C实现解析配置
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 # 从配置文件读取模板路径
+@functools.lru_cache(maxsize=1)
 def _get_template_dir():
     """从配置文件读取模板目录路径"""
     config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "configs", "app.yaml")
     with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.load(f, Loader=yaml.FullLoader)
+        config = yaml.load(f, Loader=_YAML_LOADER)
     
     base_path = config['prompt']['path']
     calendar_dir = config['prompt'].get('calendar', 'calendar')
@@ -29,9 +49,9 @@ def _get_template_dir():
     template_dir = os.path.join(base_path, calendar_dir, template_version)
     return template_dir
 
-# 初始化Jinja2环境
+# 初始化Jinja2环境（模板在进程内不会变化，关闭mtime检查）
 _template_dir = _get_template_dir()
-_jinja_env = Environment(loader=FileSystemLoader(_template_dir))
+_jinja_env = Environment(loader=FileSystemLoader(_template_dir), auto_reload=False, cache_size=400)
 
 
 def _load_template(template_name: str) -> str:
@@ -47,6 +67,37 @@ def _load_template(template_name: str) -> str:
     template = _jinja_env.get_template(f"{template_name}.j2")
     return template.render()
 
+
+# 模块加载时预先加载模板：系统提示词无变量，直接缓存渲染结果
+_SYSTEM_PROMPT = _load_template("system_prompt")
+_USER_TEMPLATE = _jinja_env.get_template("user_prompt.j2")
+
+
+def _dump_calendar(day_info: dict, hour_info: dict) -> str:
+    """
+    合并日维度和小时维度信息并转换为紧凑的JSON字符串
+    不做缩进，减少发送给大模型的token数
+    
+    Args:
+        day_info: 日维度黄历信息
+        hour_info: 小时维度黄历信息
+        
+    Returns:
+        str: 黄历信息的JSON字符串
+    """
+    calendar_data = {
+        "day_info": day_info,
+        "hour_info": hour_info
+    }
+    return orjson.dumps(calendar_data).decode()
+
+
+def _log_calendar(label: str, year: int, month: int, day: int, data: dict):
+    """将API返回的黄历数据写入日志，日志级别未开启时跳过序列化"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"{label}-{year}年{month}月{day}日: {orjson.dumps(data).decode()}")
+
+
 def get_calander_info(year: int, month: int, day: int, force_refresh: bool = False) -> str:
     """
     获取黄历信息
@@ -70,49 +121,37 @@ def get_calander_info(year: int, month: int, day: int, force_refresh: bool = Fal
         # 如果强制刷新，跳过数据库查询，直接从API获取
         if force_refresh:
             logger.info(f"强制刷新，从API获取最新黄历信息: {date_str}")
-            api = CalendarAPI()
+            # 并发获取日维度和小时维度数据，get_both_sync 会保存到数据库
+            day_info, hour_info = get_calendar_api().get_both_sync(year, month, day)
+            _log_calendar("日维度", year, month, day, day_info)
+            _log_calendar("小时维度", year, month, day, hour_info)
             
-            # 获取日维度数据信息
-            day_info = api.get_day_calendar(year, month, day)
-            logger.info(f"日维度-{year}年{month}月{day}日: {json.dumps(day_info, ensure_ascii=False)}")
-            # 保存到数据库
-            db.save_day_calendar(date_str, day_info)
-            
-            # 获取小时维度数据
-            hour_info = api.get_hour_calendar(year, month, day)
-            logger.info(f"小时维度-{year}年{month}月{day}日: {json.dumps(hour_info, ensure_ascii=False)}")
-            # 保存到数据库
-            db.save_hour_calendar(date_str, hour_info)
-            
-            # 合并信息并转换为JSON字符串
-            calendar_data = {
-                "day_info": day_info,
-                "hour_info": hour_info
-            }
-            return json.dumps(calendar_data, ensure_ascii=False, indent=2)
+            return _dump_calendar(day_info, hour_info)
         
-        # 从数据库获取数据
-        day_info = db.get_day_calendar(date_str)
-        hour_info = db.get_hour_calendar(date_str)
+        # 从数据库获取数据，日维度和小时维度在一次查询中取回
+        day_info, hour_info = db.get_calendar_bundle(date_str)
         
         # 如果数据库中有数据，直接返回
         if day_info and hour_info:
             logger.info(f"从数据库获取黄历信息: {date_str}")
-            calendar_data = {
-                "day_info": day_info,
-                "hour_info": hour_info
-            }
-            return json.dumps(calendar_data, ensure_ascii=False, indent=2)
+            return _dump_calendar(day_info, hour_info)
         
         # 如果数据库中没有数据，从API获取
         logger.info(f"数据库中没有数据，从API获取: {date_str}")
-        api = CalendarAPI()
+        api = get_calendar_api()
+        
+        # 两个维度都缺失时并发获取，get_both_sync 会保存到数据库
+        if not day_info and not hour_info:
+            day_info, hour_info = api.get_both_sync(year, month, day)
+            _log_calendar("日维度", year, month, day, day_info)
+            _log_calendar("小时维度", year, month, day, hour_info)
+            return _dump_calendar(day_info, hour_info)
         
         # 获取日维度数据信息
         if not day_info:
             day_info = api.get_day_calendar(year, month, day)
             # 将数据写入日志
-            logger.info(f"日维度-{year}年{month}月{day}日: {json.dumps(day_info, ensure_ascii=False)}")
+            _log_calendar("日维度", year, month, day, day_info)
             # 保存到数据库
             db.save_day_calendar(date_str, day_info)
         
@@ -120,21 +159,62 @@ def get_calander_info(year: int, month: int, day: int, force_refresh: bool = Fal
         if not hour_info:
             hour_info = api.get_hour_calendar(year, month, day)
             # 将数据写入日志
-            logger.info(f"小时维度-{year}年{month}月{day}日: {json.dumps(hour_info, ensure_ascii=False)}")
+            _log_calendar("小时维度", year, month, day, hour_info)
             # 保存到数据库
             db.save_hour_calendar(date_str, hour_info)
         
-        # 合并信息并转换为JSON字符串
-        calendar_data = {
-            "day_info": day_info,
-            "hour_info": hour_info
-        }
-        
-        return json.dumps(calendar_data, ensure_ascii=False, indent=2)
+        return _dump_calendar(day_info, hour_info)
     except Exception as e:
         raise Exception(f"获取数据失败: {str(e)}")
 
 
+def _build_messages(question: str, force_refresh: bool = False) -> Optional[List[Dict[str, str]]]:
+    """
+    根据问题获取黄历信息并构建发送给大模型的消息
+    
+    Args:
+        question: 用户问题（应该已经通过parse_question处理，包含具体日期）
+        force_refresh: 是否强制从API获取最新数据，忽略缓存。默认为False
+        
+    Returns:
+        Optional[List[Dict[str, str]]]: 消息列表，无法从问题中提取日期时返回None
+    """
+    # 从问题中提取日期（YYYY-MM-DD 或 YYYY年M月D日 格式）
+    date_match = _DATE_ANY.search(question)
+    if not date_match:
+        return None
+    
+    year = int(date_match.group(1))
+    month = int(date_match.group(2))
+    day = int(date_match.group(3))
+    
+    # 如果未指定force_refresh，则从问题中检测
+    if not force_refresh:
+        force_refresh = needs_force_refresh(question)
+    
+    # 获取黄历信息
+    calendar_info = get_calander_info(year, month, day, force_refresh=force_refresh)
+    
+    # 判断是否需要关注时辰信息
+    need_hour_info = needs_hour_info(question)
+    
+    # 渲染用户提示词，系统提示词已在模块加载时渲染
+    user_prompt = _USER_TEMPLATE.render(
+        today=datetime.date.today().isoformat(),
+        year=year,
+        month=month,
+        day=day,
+        calendar_info=calendar_info,
+        question=question,
+        need_hour_info=need_hour_info
+    )
+    
+    return [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
 def answer_question(question: str, force_refresh: bool = False) -> str:
     """
     回答问题
@@ -147,53 +227,63 @@ def answer_question(question: str, force_refresh: bool = False) -> str:
         str: 回答内容
     """
     try:
-        # 从问题中提取日期（YYYY-MM-DD格式）
-        date_match = re.search(r'(\d{4})-(\d{1,2})-(\d{1,2})', question)
-        if not date_match:
-            # 如果没有找到日期，尝试其他格式
-            date_match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', question)
-            if not date_match:
-                return "无法从问题中提取日期信息，请确保问题中包含具体日期（如2025-12-01）。"
-        
-        year = int(date_match.group(1))
-        month = int(date_match.group(2))
-        day = int(date_match.group(3))
-        
-        # 如果未指定force_refresh，则从问题中检测
-        if not force_refresh:
-            force_refresh_keywords = ["最新", "刷新", "重新获取", "更新", "重新拉取", "强制刷新", "重新查询"]
-            force_refresh = any(keyword in question for keyword in force_refresh_keywords)
-        
-        # 获取黄历信息
-        calendar_info = get_calander_info(year, month, day, force_refresh=force_refresh)
-        
-        # 判断是否需要关注时辰信息
-        need_hour_info = any(keyword in question for keyword in ["时辰", "几点", "什么时候", "时间", "小时", "吉时", "面试"])
-        
-        # 从模板文件加载系统提示词
-        system_prompt = _load_template("system_prompt")
-        
-        # 从模板文件加载并渲染用户提示词
-        user_template = _jinja_env.get_template("user_prompt.j2")
-        user_prompt = user_template.render(
-            year=year,
-            month=month,
-            day=day,
-            calendar_info=calendar_info,
-            question=question,
-            need_hour_info=need_hour_info
-        )
+        messages = _build_messages(question, force_refresh=force_refresh)
+        if messages is None:
+            return _NO_DATE_MESSAGE
         
         # 调用大模型
         llm = create_llm_client(provider="deepseek")
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
         # answer = llm.chat(messages, model="GLM-4-Flash-250414", temperature=0.7)
-        answer = llm.chat(messages, model="deepseek-r1-250528", temperature=0.7)
+        answer = llm.chat(messages, model=_ANSWER_MODEL, temperature=0.7)
 
         return answer
         
     except Exception as e:
         return f"处理问题时出错：{str(e)}"
+
+
+async def answer_question_async(question: str, force_refresh: bool = False) -> str:
+    """
+    回答问题的异步版本，数据库/API读取在线程池中执行，大模型调用不阻塞事件循环
+    
+    Args:
+        question: 用户问题（应该已经通过parse_question处理，包含具体日期）
+        force_refresh: 是否强制从API获取最新数据，忽略缓存。默认为False
+        
+    Returns:
+        str: 回答内容
+    """
+    try:
+        messages = await asyncio.to_thread(_build_messages, question, force_refresh)
+        if messages is None:
+            return _NO_DATE_MESSAGE
+        
+        llm = create_llm_client(provider="deepseek")
+        return await llm.chat_async(messages, model=_ANSWER_MODEL, temperature=0.7)
+        
+    except Exception as e:
+        return f"处理问题时出错：{str(e)}"
+
+
+def answer_question_stream(question: str, force_refresh: bool = False) -> Iterator[str]:
+    """
+    流式回答问题，模型每生成一段内容就立即返回，用于命令行等需要尽快展示结果的场景
+    
+    Args:
+        question: 用户问题（应该已经通过parse_question处理，包含具体日期）
+        force_refresh: 是否强制从API获取最新数据，忽略缓存。默认为False
+        
+    Yields:
+        str: 回答内容片段
+    """
+    try:
+        messages = _build_messages(question, force_refresh=force_refresh)
+        if messages is None:
+            yield _NO_DATE_MESSAGE
+            return
+        
+        llm = create_llm_client(provider="deepseek")
+        yield from llm.chat_stream(messages, model=_ANSWER_MODEL, temperature=0.7)
+        
+    except Exception as e:
+        yield f"处理问题时出错：{str(e)}"
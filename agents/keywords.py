@@ -0,0 +1,70 @@
+"""
+问题关键词匹配模块
+集中维护各处共用的关键词列表，并预先构建匹配器，避免每次调用逐个子串扫描
+"""
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# 强制刷新关键词：问题中包含这些词时忽略缓存，从API获取最新数据
+FORCE_REFRESH_KEYWORDS = ("最新", "刷新", "重新获取", "更新", "重新拉取", "强制刷新", "重新查询")
+
+# 时辰关键词：问题中包含这些词时需要重点关注时辰信息
+HOUR_KEYWORDS = ("时辰", "几点", "什么时候", "时间", "小时", "吉时", "面试")
+
+
+class _KeywordMatcher:
+    """
+    多关键词匹配器，对问题只扫描一遍
+    安装了 pyahocorasick 时使用 Aho-Corasick 自动机，否则退化为预编译的正则多选分支
+    """
+    
+    def __init__(self, keywords):
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+            self._pattern = None
+        else:
+            self._automaton = None
+            self._pattern = re.compile("|".join(map(re.escape, keywords)))
+    
+    def search(self, text: str) -> bool:
+        """文本中是否包含任一关键词"""
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        return self._pattern.search(text) is not None
+
+
+_FORCE_REFRESH_MATCHER = _KeywordMatcher(FORCE_REFRESH_KEYWORDS)
+_HOUR_MATCHER = _KeywordMatcher(HOUR_KEYWORDS)
+
+
+def needs_force_refresh(question: str) -> bool:
+    """
+    判断问题是否要求强制刷新数据
+    
+    Args:
+        question: 用户问题
+        
+    Returns:
+        bool: 是否包含强制刷新关键词
+    """
+    return _FORCE_REFRESH_MATCHER.search(question)
+
+
+def needs_hour_info(question: str) -> bool:
+    """
+    判断问题是否涉及时辰信息
+    
+    Args:
+        question: 用户问题
+        
+    Returns:
+        bool: 是否包含时辰关键词
+    """
+    return _HOUR_MATCHER.search(question)
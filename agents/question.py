@@ -1,28 +1,45 @@
 import datetime
+import re
+from typing import Dict, List, Optional
 
 from models.llm_client import create_llm_client
+from pkg.cache.cache import TTLCache
 
+# 日期匹配正则，模块加载时编译一次
+_DATE_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_DATE_CN = re.compile(r"(\d{4})年(\d{1,2})月(\d{1,2})日")
 
-def parse_question(question: str) -> str:
-    """
-    解析用户问题，将相对日期转换为具体日期
-    
-    Args:
-        question: 用户问题
-        
-    Returns:
-        str: 转换后的问题，如果无法识别日期则返回提示信息
-    """
-    # python获取今天的日期，格式为YYYY-MM-DD
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
+# 常见相对日期 -> 相对今天的天数偏移
+# "后日"、"前日"多出现在"今后日子"、"此前日期"等词语中，不在本地换算，交给大模型处理
+_RELATIVE_DAY_OFFSETS = {
+    "今天": 0, "今日": 0,
+    "明天": 1, "明日": 1,
+    "后天": 2,
+    "大后天": 3,
+    "昨天": -1, "昨日": -1,
+    "前天": -2,
+    "大前天": -3,
+}
+# 问题中出现的所有相对日期词，"大后天"、"大前天"放在最前面，保证优先于"后天"、"前天"匹配
+_RELATIVE_DAY_RE = re.compile("大后天|大前天|今天|今日|明天|明日|后天|昨天|昨日|前天")
+# 可以确定是相对日期的位置（白名单）：前面是开头、空白、标点或"是/在/的/查/问/看/和/与/或"，
+# 后面不是"气/色/数/子/程/本"等会与之组成其他词语的字，如"三天前天气"、"下午后天色"
+_RELATIVE_DAY_SAFE_RE = re.compile(
+    r"(?<![^\s\W是在的查问看和与或])"
+    r"(?:大后天|大前天|今天|今日|明天|明日|后天|昨天|昨日|前天)"
+    r"(?![气色数子程本性]|八卦)"
+)
+
+# 日期转换使用的模型
+_PARSE_MODEL = "deepseek-r1-250528"
 
-    # 设置提示词，将today替换到提示词中
-    system_prompt = f"""你是一个日期转换助手。今天的日期是{today}。
+# 日期转换的系统提示词，不含任何变量，保证每次请求的前缀字节完全一致
+_PARSE_SYSTEM_PROMPT = """你是一个日期转换助手。用户消息中会给出今天的日期。
 
 你的任务是将用户问题中的相对日期（如"今天"、"明天"、"后天"、"大后天"等）转换为具体的日期格式（YYYY-MM-DD）。
 
 转换规则：
-- 今天 = {today}
+- 今天 = 用户消息中给出的今天的日期
 - 明天 = 今天的日期 + 1天
 - 后天 = 今天的日期 + 2天
 - 大后天 = 今天的日期 + 3天
@@ -35,16 +52,115 @@ def parse_question(question: str) -> str:
 
 请只返回转换后的问题文本，不要添加任何解释或说明。"""
 
-    user_prompt = f"用户问题：{question}\n\n请根据上述规则转换日期并返回转换后的问题。"
+# LLM解析结果缓存，键为 (今天日期, 问题)，日期变化后自然失效
+_parse_cache = TTLCache(maxsize=1024, ttl=3600)
+
+
+def _parse_locally(question: str) -> Optional[str]:
+    """
+    不调用大模型，直接在本地转换问题中的日期
+    
+    Args:
+        question: 用户问题
+        
+    Returns:
+        Optional[str]: 转换后的问题，无法在本地转换时返回None
+    """
+    # 已包含具体日期，无需转换
+    if _DATE_ISO.search(question) or _DATE_CN.search(question):
+        return question
+
+    # 常见相对日期直接在本地换算，避免一次LLM调用
+    # 只要有一个相对日期词不在白名单位置（可能是其他词语的一部分），就整体交给大模型处理
+    spans = [m.span() for m in _RELATIVE_DAY_RE.finditer(question)]
+    if spans and spans == [m.span() for m in _RELATIVE_DAY_SAFE_RE.finditer(question)]:
+        today_date = datetime.date.today()
+        return _RELATIVE_DAY_SAFE_RE.sub(
+            lambda m: (today_date + datetime.timedelta(days=_RELATIVE_DAY_OFFSETS[m.group()])).isoformat(),
+            question
+        )
+
+    return None
+
+
+def _build_parse_messages(today: str, question: str) -> List[Dict[str, str]]:
+    """
+    构建日期转换的大模型消息
+    
+    Args:
+        today: 今天的日期，格式为YYYY-MM-DD
+        question: 用户问题
+        
+    Returns:
+        List[Dict[str, str]]: 消息列表
+    """
+    # 系统提示词保持固定不变，今天的日期放在用户消息中，便于服务端缓存提示词前缀
+    user_prompt = f"今天的日期是{today}。\n\n用户问题：{question}\n\n请根据上述规则转换日期并返回转换后的问题。"
+    return [
+        {"role": "system", "content": _PARSE_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def parse_question(question: str) -> str:
+    """
+    解析用户问题，将相对日期转换为具体日期
+    
+    Args:
+        question: 用户问题
+        
+    Returns:
+        str: 转换后的问题，如果无法识别日期则返回提示信息
+    """
+    local_result = _parse_locally(question)
+    if local_result is not None:
+        return local_result
+
+    # python获取今天的日期，格式为YYYY-MM-DD
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
+
+    cache_key = (today, question.strip())
+    cached = _parse_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:
         llm = create_llm_client(provider="deepseek")
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
-        result = llm.chat(messages, model="deepseek-r1-250528", temperature=0.3)
-        return result.strip()
+        messages = _build_parse_messages(today, question)
+        result = llm.chat(messages, model=_PARSE_MODEL, temperature=0.3).strip()
+        _parse_cache.set(cache_key, result)
+        return result
     except Exception as e:
         # 如果调用失败，返回错误信息
         return f"处理问题时出错：{str(e)}"
+
+
+async def parse_question_async(question: str) -> str:
+    """
+    解析用户问题的异步版本，大模型调用不阻塞事件循环
+    
+    Args:
+        question: 用户问题
+        
+    Returns:
+        str: 转换后的问题，如果无法识别日期则返回提示信息
+    """
+    local_result = _parse_locally(question)
+    if local_result is not None:
+        return local_result
+
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
+
+    cache_key = (today, question.strip())
+    cached = _parse_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        llm = create_llm_client(provider="deepseek")
+        messages = _build_parse_messages(today, question)
+        result = (await llm.chat_async(messages, model=_PARSE_MODEL, temperature=0.3)).strip()
+        _parse_cache.set(cache_key, result)
+        return result
+    except Exception as e:
+        return f"处理问题时出错：{str(e)}"
@@ -0,0 +1,49 @@
+"""
+测试问题日期解析功能
+测试本地相对日期换算不会误替换更长词语中的字
+"""
+import datetime
+
+from agents.question import _parse_locally
+
+
+def _day(offset):
+    """返回相对今天偏移 offset 天的日期字符串"""
+    return (datetime.date.today() + datetime.timedelta(days=offset)).isoformat()
+
+
+class TestParseLocally:
+    """本地日期换算测试类"""
+
+    def test_relative_days(self):
+        """常见相对日期换算为具体日期"""
+        assert _parse_locally("今天适合搬家吗") == f"{_day(0)}适合搬家吗"
+        assert _parse_locally("明日宜忌") == f"{_day(1)}宜忌"
+        assert _parse_locally("大后天是什么日子") == f"{_day(3)}是什么日子"
+        assert _parse_locally("前天冲什么生肖") == f"{_day(-2)}冲什么生肖"
+        assert _parse_locally("大前天和昨天的黄历") == f"{_day(-3)}和{_day(-1)}的黄历"
+
+    def test_absolute_date_unchanged(self):
+        """已包含具体日期的问题保持不变"""
+        assert _parse_locally("2025-12-01后天宜忌") == "2025-12-01后天宜忌"
+
+    def test_particles_before_relative_day(self):
+        """相对日期词前面是标点或常见虚词时正常换算"""
+        assert _parse_locally("请问，明天适合出行吗") == f"请问，{_day(1)}适合出行吗"
+        assert _parse_locally("查昨日的黄历") == f"查{_day(-1)}的黄历"
+
+    def test_ambiguous_falls_back_to_llm(self):
+        """相对日期词可能是其他词语的一部分时返回None，交给大模型处理"""
+        for question in (
+            "以后天气怎么样",
+            "提前天数怎么算",
+            "聪明天才",
+            "今后日子好过吗",
+            "此前日期是哪天",
+            "三天前天气怎么样",
+            "日后日程安排",
+            "下午后天色",
+            "后天八卦里今天财神在哪",
+            "如今天气怎么样，后天呢",
+        ):
+            assert _parse_locally(question) is None, question
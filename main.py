@@ -4,6 +4,7 @@
 
 import agents.question as agent_question
 import agents.calander as agent_calander
+from agents.keywords import needs_force_refresh
 from dotenv import load_dotenv
 from pkg.sqlite.sqlite import init_db
 
@@ -22,12 +23,14 @@ def main():
             return
 
         # 在解析问题之前检测是否需要强制刷新（避免LLM转换时丢失关键词）
-        force_refresh_keywords = ["最新", "刷新", "重新获取", "更新", "重新拉取", "强制刷新", "重新查询"]
-        force_refresh = any(keyword in question for keyword in force_refresh_keywords)
+        force_refresh = needs_force_refresh(question)
         
         qs = agent_question.parse_question(question)
-        answer = agent_calander.answer_question(qs, force_refresh=force_refresh)
-        print(f"\n{answer}")
+        # 流式输出回答，模型生成的内容即时打印
+        print()
+        for chunk in agent_calander.answer_question_stream(qs, force_refresh=force_refresh):
+            print(chunk, end="", flush=True)
+        print()
         print("-" * 50)
         
     except KeyboardInterrupt:
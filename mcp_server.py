@@ -3,6 +3,7 @@ MCP服务器实现
 将黄历AI Agent功能暴露为MCP工具
 """
 import asyncio
+import datetime
 import json
 import os
 import sys
@@ -32,13 +33,20 @@ except ImportError:
         sys.exit(1)
 
 import agents.question as agent_question
-import agents.calander as agent_calander
+from agents.keywords import needs_force_refresh
+from pkg.cache.cache import TTLCache
 from pkg.sqlite.sqlite import init_db
 
 
 # 初始化服务器
 app = Server("cardcaptor-calendar")
 
+# 日期匹配正则，模块加载时编译一次，一次扫描同时匹配 YYYY-MM-DD 和 YYYY年M月D日 两种格式
+_DATE_ANY = re.compile(r"(\d{4})[-年](\d{1,2})[-月](\d{1,2})日?")
+
+# 问答结果缓存，键为 (今天日期, 问题)，同一天内重复的问题直接返回
+_answer_cache = TTLCache(maxsize=1024, ttl=3600)
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -96,6 +104,10 @@ async def call_tool(name: str, arguments: dict[str, Any] | None) -> Sequence[Tex
         arguments = {}
 
     try:
+        # 延迟导入：仅列出工具时不需要加载大模型SDK和模板环境
+        # 放在 try 内，首次导入失败（配置、模板加载等）时同样返回错误信息
+        import agents.calander as agent_calander
+
         if name == "get_calendar_info":
             date = arguments.get("date", "")
             force_refresh = arguments.get("force_refresh", False)
@@ -107,24 +119,24 @@ async def call_tool(name: str, arguments: dict[str, Any] | None) -> Sequence[Tex
                 )]
             
             # 解析日期，将相对日期转换为具体日期
-            parsed_question = agent_question.parse_question(f"查询{date}的黄历信息")
+            parsed_question = await agent_question.parse_question_async(f"查询{date}的黄历信息")
             
             # 从解析后的问题中提取日期
-            date_match = re.search(r'(\d{4})-(\d{1,2})-(\d{1,2})', parsed_question)
+            date_match = _DATE_ANY.search(parsed_question)
             if not date_match:
-                date_match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', parsed_question)
-                if not date_match:
-                    return [TextContent(
-                        type="text",
-                        text=f"无法解析日期：{date}。请使用相对日期（今天、明天等）或具体日期（YYYY-MM-DD格式）"
-                    )]
+                return [TextContent(
+                    type="text",
+                    text=f"无法解析日期：{date}。请使用相对日期（今天、明天等）或具体日期（YYYY-MM-DD格式）"
+                )]
             
             year = int(date_match.group(1))
             month = int(date_match.group(2))
             day = int(date_match.group(3))
             
             # 获取黄历信息
-            calendar_info = agent_calander.get_calander_info(year, month, day, force_refresh=force_refresh)
+            calendar_info = await asyncio.to_thread(
+                agent_calander.get_calander_info, year, month, day, force_refresh=force_refresh
+            )
             
             return [TextContent(
                 type="text",
@@ -141,8 +153,19 @@ async def call_tool(name: str, arguments: dict[str, Any] | None) -> Sequence[Tex
                     text="错误：必须提供问题参数"
                 )]
             
+            # 强制刷新时不使用缓存
+            use_cache = not (force_refresh or needs_force_refresh(question))
+            cache_key = (datetime.date.today().isoformat(), question.strip())
+            if use_cache:
+                cached_answer = _answer_cache.get(cache_key)
+                if cached_answer is not None:
+                    return [TextContent(
+                        type="text",
+                        text=cached_answer
+                    )]
+            
             # 解析问题，将相对日期转换为具体日期
-            parsed_question = agent_question.parse_question(question)
+            parsed_question = await agent_question.parse_question_async(question)
             
             # 检查是否包含日期信息
             if "无法从问题中提取日期信息" in parsed_question or "请输入具体的时间日期" in parsed_question:
@@ -152,7 +175,11 @@ async def call_tool(name: str, arguments: dict[str, Any] | None) -> Sequence[Tex
                 )]
             
             # 回答问题
-            answer = agent_calander.answer_question(parsed_question, force_refresh=force_refresh)
+            answer = await agent_calander.answer_question_async(parsed_question, force_refresh=force_refresh)
+            
+            # 出错的回答不缓存
+            if not answer.startswith(("处理问题时出错", "无法从问题中提取日期信息")):
+                _answer_cache.set(cache_key, answer)
             
             return [TextContent(
                 type="text",
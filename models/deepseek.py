@@ -2,14 +2,18 @@
 DeepSeek API客户端
 """
 import os
-from typing import Optional, Dict, List
-from openai import OpenAI
-from models.llm_client import LLMClient
+from typing import Optional, Dict
+from models.llm_client import OpenAICompatibleClient
 
 
-class DeepSeekClient(LLMClient):
+class DeepSeekClient(OpenAICompatibleClient):
     """DeepSeek API客户端"""
     
+    api_name = "DeepSeek API"
+    env_prefix = "DEEPSEEK"
+    default_base_url = "https://api.deepseek.com/v1"
+    default_model = "deepseek-chat"
+    
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
         初始化DeepSeek客户端
@@ -18,54 +22,28 @@ class DeepSeekClient(LLMClient):
             api_key: API密钥，如果为None则从环境变量DEEPSEEK_API_KEY获取
             base_url: API基础URL，如果为None则从环境变量DEEPSEEK_BASE_URL获取，否则使用默认值
         """
+        # 提示词缓存键，服务端支持 prompt_cache_key 时用于命中固定的系统提示词前缀
+        self.prompt_cache_key = os.getenv("DEEPSEEK_PROMPT_CACHE_KEY", "")
         super().__init__(api_key, base_url)
-        if api_key:
-            self.api_key = api_key
-        else:
-            self.api_key = os.getenv("DEEPSEEK_API_KEY", "")
-        
-        if base_url:
-            self.base_url = base_url
-        else:
-            self.base_url = os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com/v1")
-        
-        if not self.api_key:
-            raise ValueError("需要设置DEEPSEEK_API_KEY环境变量或传入api_key参数")
-        
-        # 获取 source-sn 配置
+    
+    def _default_headers(self) -> Optional[Dict[str, str]]:
+        """附加 source-sn 请求头"""
         source_sn = os.getenv("DEEPSEEK_SOURCE_SN", "prompt-engine")
-        
-        # 初始化 OpenAI 客户端，支持自定义 headers
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-            default_headers={
-                "source-sn": source_sn
-            }
-        )
+        return {
+            "source-sn": source_sn
+        }
     
-    def chat(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> str:
+    def _prepare_request(self, model: Optional[str], kwargs: Dict) -> str:
         """
-        发送聊天请求到DeepSeek API
+        补全请求参数：配置了提示词缓存键时附加到请求中，未指定模型时使用默认模型
         
         Args:
-            messages: 消息列表
-            model: 模型名称，如果为None则从环境变量DEEPSEEK_LLM_MODEL获取，默认deepseek-chat
-            **kwargs: 其他参数（temperature, max_tokens等）
+            model: 模型名称
+            kwargs: 其他请求参数，原地修改
             
         Returns:
-            str: 模型回复内容
+            str: 实际使用的模型名称
         """
-        if model is None:
-            model = os.getenv("DEEPSEEK_LLM_MODEL", "deepseek-chat")
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                **kwargs
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            raise Exception(f"调用DeepSeek API时出错: {str(e)}")
-
+        if self.prompt_cache_key and "extra_body" not in kwargs:
+            kwargs["extra_body"] = {"prompt_cache_key": self.prompt_cache_key}
+        return super()._prepare_request(model, kwargs)
@@ -2,7 +2,78 @@
 大模型客户端模块
 支持多种大模型API
 """
-from typing import Optional, Dict, List
+import asyncio
+import os
+import threading
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple, Any, Iterator, Callable
+
+
+# 进程内共享的HTTP客户端，所有基于OpenAI SDK的客户端复用同一个keep-alive连接池
+_http_client = None
+_http_client_lock = threading.Lock()
+# 异步客户端的连接绑定在创建它的事件循环上，因此按事件循环分别缓存
+_async_http_clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+_loop_cache_lock = threading.RLock()
+
+
+def get_loop_local(cache: Dict[asyncio.AbstractEventLoop, Any], factory: Callable[[], Any]) -> Any:
+    """
+    获取绑定到当前运行事件循环的缓存对象，不存在时调用 factory 创建
+    同时清理已关闭事件循环的对象，避免多次 asyncio.run 时复用已失效的连接
+    
+    Args:
+        cache: 事件循环到对象的缓存字典
+        factory: 创建对象的函数
+        
+    Returns:
+        Any: 当前事件循环对应的对象
+    """
+    loop = asyncio.get_running_loop()
+    with _loop_cache_lock:
+        for closed_loop in [l for l in cache if l.is_closed()]:
+            del cache[closed_loop]
+        value = cache.get(loop)
+        if value is None:
+            value = factory()
+            cache[loop] = value
+    return value
+
+
+def get_http_client():
+    """
+    获取共享的httpx客户端（单例模式）
+    
+    Returns:
+        httpx.Client: 供OpenAI SDK使用的HTTP客户端
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                import httpx
+                from openai import DefaultHttpxClient
+                _http_client = DefaultHttpxClient(
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+                )
+    return _http_client
+
+
+def get_async_http_client():
+    """
+    获取当前事件循环共享的异步httpx客户端，需在协程中调用
+    
+    Returns:
+        httpx.AsyncClient: 供AsyncOpenAI使用的HTTP客户端
+    """
+    def create():
+        import httpx
+        from openai import DefaultAsyncHttpxClient
+        return DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    
+    return get_loop_local(_async_http_clients, create)
 
 
 class LLMClient:
@@ -25,6 +96,193 @@ class LLMClient:
             str: 模型回复内容
         """
         raise NotImplementedError
+    
+    def chat_stream(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> Iterator[str]:
+        """
+        以流式方式发送聊天请求
+        默认实现一次性返回完整回复，支持流式输出的客户端应覆盖此方法
+        
+        Args:
+            messages: 消息列表，格式为 [{"role": "user", "content": "..."}]
+            model: 模型名称（如果为None，将使用默认模型）
+            **kwargs: 其他参数
+            
+        Yields:
+            str: 模型回复内容片段
+        """
+        yield self.chat(messages, model=model, **kwargs)
+    
+    async def chat_async(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> str:
+        """
+        异步发送聊天请求
+        默认实现在线程池中执行同步的chat，支持异步SDK的客户端应覆盖此方法
+        
+        Args:
+            messages: 消息列表，格式为 [{"role": "user", "content": "..."}]
+            model: 模型名称（如果为None，将使用默认模型）
+            **kwargs: 其他参数
+            
+        Returns:
+            str: 模型回复内容
+        """
+        return await asyncio.to_thread(self.chat, messages, model, **kwargs)
+
+
+
+class OpenAICompatibleClient(LLMClient):
+    """
+    兼容OpenAI接口的大模型客户端基类
+    子类只需提供配置：API名称、环境变量前缀、默认地址和默认模型，需要额外请求头时覆盖 _default_headers
+    """
+    
+    # 错误信息中使用的API名称，如 "DeepSeek API"
+    api_name: str = ""
+    # 环境变量前缀，分别读取 {前缀}_API_KEY、{前缀}_BASE_URL、{前缀}_LLM_MODEL
+    env_prefix: str = ""
+    # 默认API基础URL
+    default_base_url: str = ""
+    # 默认模型名称
+    default_model: str = ""
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        """
+        初始化客户端
+        
+        Args:
+            api_key: API密钥，如果为None则从环境变量{前缀}_API_KEY获取
+            base_url: API基础URL，如果为None则从环境变量{前缀}_BASE_URL获取，否则使用默认值
+        """
+        super().__init__(api_key, base_url)
+        self.api_key = api_key or os.getenv(f"{self.env_prefix}_API_KEY", "")
+        self.base_url = base_url or os.getenv(f"{self.env_prefix}_BASE_URL", self.default_base_url)
+        
+        if not self.api_key:
+            raise ValueError(f"需要设置{self.env_prefix}_API_KEY环境变量或传入api_key参数")
+        
+        self.default_headers = self._default_headers()
+        
+        # 初始化 OpenAI 客户端（延迟导入openai，未使用该客户端时不加载整个SDK）
+        from openai import OpenAI
+        self.client = OpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=get_http_client(),
+            default_headers=self.default_headers
+        )
+        # 异步客户端在首次异步调用时创建，按事件循环分别缓存
+        self._async_clients = {}
+    
+    def _default_headers(self) -> Optional[Dict[str, str]]:
+        """
+        每个请求附加的请求头
+        
+        Returns:
+            Optional[Dict[str, str]]: 请求头，不需要时返回 None
+        """
+        return None
+    
+    def _get_async_client(self):
+        """获取当前事件循环的异步 OpenAI 客户端，首次调用时创建"""
+        def create():
+            from openai import AsyncOpenAI
+            return AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=get_async_http_client(),
+                default_headers=self.default_headers
+            )
+        
+        return get_loop_local(self._async_clients, create)
+    
+    def _prepare_request(self, model: Optional[str], kwargs: Dict) -> str:
+        """
+        补全请求参数：未指定模型时使用 {前缀}_LLM_MODEL 环境变量或默认模型
+        
+        Args:
+            model: 模型名称
+            kwargs: 其他请求参数，子类可原地修改
+            
+        Returns:
+            str: 实际使用的模型名称
+        """
+        if model is None:
+            model = os.getenv(f"{self.env_prefix}_LLM_MODEL", self.default_model)
+        return model
+    
+    def chat(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> str:
+        """
+        发送聊天请求
+        
+        Args:
+            messages: 消息列表
+            model: 模型名称，如果为None则从环境变量{前缀}_LLM_MODEL获取，否则使用默认模型
+            **kwargs: 其他参数（temperature, max_tokens等）
+            
+        Returns:
+            str: 模型回复内容
+        """
+        model = self._prepare_request(model, kwargs)
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            raise Exception(f"调用{self.api_name}时出错: {str(e)}")
+    
+    def chat_stream(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> Iterator[str]:
+        """
+        以流式方式发送聊天请求
+        
+        Args:
+            messages: 消息列表
+            model: 模型名称，如果为None则从环境变量{前缀}_LLM_MODEL获取，否则使用默认模型
+            **kwargs: 其他参数（temperature, max_tokens等）
+            
+        Yields:
+            str: 模型回复内容片段
+        """
+        model = self._prepare_request(model, kwargs)
+        
+        try:
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                **kwargs
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise Exception(f"调用{self.api_name}时出错: {str(e)}")
+    
+    async def chat_async(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> str:
+        """
+        异步发送聊天请求，不阻塞事件循环
+        
+        Args:
+            messages: 消息列表
+            model: 模型名称，如果为None则从环境变量{前缀}_LLM_MODEL获取，否则使用默认模型
+            **kwargs: 其他参数（temperature, max_tokens等）
+            
+        Returns:
+            str: 模型回复内容
+        """
+        model = self._prepare_request(model, kwargs)
+        
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            raise Exception(f"调用{self.api_name}时出错: {str(e)}")
 
 
 def create_llm_client(provider: str = "openai", **kwargs) -> LLMClient:
@@ -36,8 +294,15 @@ def create_llm_client(provider: str = "openai", **kwargs) -> LLMClient:
         **kwargs: 传递给客户端的参数
         
     Returns:
-        LLMClient: LLM客户端实例
+        LLMClient: LLM客户端实例，相同参数的调用返回同一个实例
     """
+    return _create_llm_client(provider, tuple(sorted(kwargs.items())))
+
+
+@lru_cache(maxsize=None)
+def _create_llm_client(provider: str, kwargs_items: Tuple[Tuple[str, Any], ...]) -> LLMClient:
+    """按 (provider, kwargs) 缓存客户端实例，避免每次调用重建客户端和连接池"""
+    kwargs = dict(kwargs_items)
     provider_lower = provider.lower()
     
     if provider_lower == "qwen":
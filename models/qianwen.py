@@ -31,6 +31,9 @@ class QwenClient(LLMClient):
         
         if not self.api_key:
             raise ValueError("需要设置QWEN_API_KEY环境变量或传入api_key参数")
+        
+        # 复用同一个Session，保持HTTP keep-alive连接
+        self.session = requests.Session()
     
     def chat(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> str:
         """
@@ -62,7 +65,7 @@ class QwenClient(LLMClient):
         }
         
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=60)
+            response = self.session.post(url, headers=headers, json=data, timeout=60)
             response.raise_for_status()
             result = response.json()
             return result["output"]["choices"][0]["message"]["content"]
@@ -2,6 +2,7 @@
 测试模型对话功能
 测试各个模型是否能够正常进行问答对话
 """
+import asyncio
 import os
 import pytest
 from dotenv import load_dotenv
@@ -14,101 +15,42 @@ class TestModelChat:
     # 加载环境变量
     load_dotenv(dotenv_path="configs/.env")
 
-    def test_deepseek_chat(self):
-        """测试DeepSeek模型对话"""
-        # 检查是否有API密钥
-        api_key = os.getenv("DEEPSEEK_API_KEY")
-        if not api_key:
-            pytest.skip("未设置DEEPSEEK_API_KEY环境变量，跳过测试")
-
-        # 创建客户端
-        client = create_llm_client("deepseek")
-
-        # 构建消息
-        messages = [
-            {"role": "user", "content": "你好，请简单介绍一下你自己。"}
-        ]
-
-        # 发送请求
-        response = client.chat(messages,model="deepseek-r1-250528")
-
-        # 验证响应
-        assert response is not None
-        assert isinstance(response, str)
-        assert len(response) > 0
-        print(f"\nDeepSeek回复: {response}")
-
-    def test_zhipu_chat(self):
-        """测试智谱AI模型对话"""
-        # 检查是否有API密钥
-        api_key = os.getenv("ZHIPU_API_KEY")
-        if not api_key:
-            pytest.skip("未设置ZHIPU_API_KEY环境变量，跳过测试")
-
-        # 创建客户端
-        client = create_llm_client("zhipu")
-
-        # 构建消息
-        messages = [
-            {"role": "user", "content": "你好，请简单介绍一下你自己。"}
+    def test_all_chats(self):
+        """并发测试各模型对话，总耗时取决于最慢的模型而不是所有模型耗时之和"""
+        # (提供商, API密钥环境变量, 模型名称)
+        providers = [
+            ("deepseek", "DEEPSEEK_API_KEY", "deepseek-r1-250528"),
+            ("zhipu", "ZHIPU_API_KEY", "GLM-4-Flash-250414"),
+            ("qwen", "QWEN_API_KEY", "qwen_72b"),
+            ("doubao", "DOUBAO_API_KEY", None),
         ]
-
-        # 发送请求
-        response = client.chat(messages, model="GLM-4-Flash-250414")
-
-        # 验证响应
-        assert response is not None
-        assert isinstance(response, str)
-        assert len(response) > 0
-        print(f"\n智谱AI回复: {response}")
-
-    def test_qwen_chat(self):
-        """测试通义千问模型对话"""
-        # 检查是否有API密钥
-        api_key = os.getenv("QWEN_API_KEY")
-        if not api_key:
-            pytest.skip("未设置QWEN_API_KEY环境变量，跳过测试")
-
-        # 创建客户端
-        client = create_llm_client("qwen")
+        # 只测试设置了API密钥的模型
+        providers = [(provider, model) for provider, env_key, model in providers if os.getenv(env_key)]
+        if not providers:
+            pytest.skip("未设置任何模型的API密钥环境变量，跳过测试")
 
         # 构建消息
         messages = [
             {"role": "user", "content": "你好，请简单介绍一下你自己。"}
         ]
 
-        # 发送请求
-        response = client.chat(messages, model="qwen_72b")
-
-        # 验证响应
-        assert response is not None
-        assert isinstance(response, str)
-        assert len(response) > 0
-        print(f"\n通义千问回复: {response}")
-
-    def test_doubao_chat(self):
-        """测试豆包模型对话"""
-        # 检查是否有API密钥
-        api_key = os.getenv("DOUBAO_API_KEY")
-        if not api_key:
-            pytest.skip("未设置DOUBAO_API_KEY环境变量，跳过测试")
-
-        # 创建客户端
-        client = create_llm_client("doubao")
-
-        # 构建消息
-        messages = [
-            {"role": "user", "content": "你好，请简单介绍一下你自己。"}
-        ]
+        async def chat_all():
+            coros = [
+                create_llm_client(provider).chat_async(messages, model=model)
+                for provider, model in providers
+            ]
+            return await asyncio.gather(*coros, return_exceptions=True)
 
-        # 发送请求
-        response = client.chat(messages)
+        # 并发发送请求
+        responses = asyncio.run(chat_all())
 
         # 验证响应
-        assert response is not None
-        assert isinstance(response, str)
-        assert len(response) > 0
-        print(f"\n豆包回复: {response}")
+        for (provider, _), response in zip(providers, responses):
+            assert not isinstance(response, Exception), f"{provider}调用失败: {response}"
+            assert response is not None
+            assert isinstance(response, str)
+            assert len(response) > 0
+            print(f"\n{provider}回复: {response}")
 
     def test_deepseek_multi_turn_chat(self):
         """测试DeepSeek多轮对话"""
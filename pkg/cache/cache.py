@@ -0,0 +1,81 @@
+"""
+进程内缓存模块
+提供带容量上限和过期时间的线程安全缓存
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """带过期时间的LRU缓存"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        """
+        初始化缓存
+        
+        Args:
+            maxsize: 最大缓存条目数，超出时淘汰最久未使用的条目
+            ttl: 条目过期时间（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取缓存值
+        
+        Args:
+            key: 缓存键
+            default: 未命中或已过期时返回的默认值
+            
+        Returns:
+            Any: 缓存值
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        """
+        写入缓存值
+        
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        """
+        删除缓存值
+        
+        Args:
+            key: 缓存键
+            default: 不存在时返回的默认值
+            
+        Returns:
+            Any: 被删除的缓存值
+        """
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
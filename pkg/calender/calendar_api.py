@@ -2,11 +2,27 @@
 黄历API客户端模块
 用于获取黄历信息
 """
+import atexit
 import os
-import requests
+import threading
+import time
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from pkg.sqlite.sqlite import get_db
+
+if TYPE_CHECKING:
+    import requests
+
+# 最优API地址的有效期（秒），过期后重新获取
+_IP_TTL = 3600
+# 最优API地址在数据库元信息表中的键，进程重启后可直接复用
+_IP_META_KEY = "calendar_api_ip"
+# 日维度和小时维度接口路径
+_DAY_PATH = "/api/time/getzdday.php"
+_HOUR_PATH = "/api/time/getzddayh.php"
 
 
 class CalendarAPI:
@@ -15,8 +31,37 @@ class CalendarAPI:
     def __init__(self):
         self.api_base_url = os.getenv("CALENDAR_BASE_URL")
         self.current_ip = None
+        # 当前IP地址的过期时间（time.monotonic 时钟）
+        self._ip_expires_at = 0.0
         self.id = os.getenv("CALENDAR_API_ID", "")
         self.key = os.getenv("CALENDAR_API_KEY", "")
+        
+        # 延迟导入requests，仅在创建客户端时加载
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # 复用同一个Session，开启HTTP keep-alive和连接池，避免每次请求重新建立TCP连接
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        
+        # 并发请求日维度和小时维度数据的线程池，两个请求共用上面的Session连接池和重试策略
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="calendar-api")
+        # 切换API地址时加锁，避免并发请求重复获取最优地址
+        self._ip_lock = threading.Lock()
+        atexit.register(self.close)
+    
+    def close(self):
+        """关闭线程池和Session，释放连接池中的连接"""
+        self._executor.shutdown(wait=False)
+        self.session.close()
     
     def get_optimal_api_ip(self) -> str:
         """
@@ -26,7 +71,7 @@ class CalendarAPI:
             str: API的IP地址
         """
         try:
-            response = requests.get(self.api_base_url, timeout=10)
+            response = self.session.get(self.api_base_url, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -36,16 +81,88 @@ class CalendarAPI:
                 # 提取IP地址（去除http://和末尾的/）
                 ip = api_url.replace("http://", "").replace("https://", "").rstrip("/")
                 self.current_ip = ip
+                self._ip_expires_at = time.monotonic() + _IP_TTL
+                self._save_ip(ip)
                 return ip
             else:
                 raise Exception(f"获取API地址失败: {data}")
         except Exception as e:
             raise Exception(f"获取最优API地址时出错: {str(e)}")
     
+    def _save_ip(self, ip: str):
+        """将API地址写入数据库，持久化失败不影响本次请求"""
+        try:
+            get_db().set_meta(_IP_META_KEY, ip, ttl=_IP_TTL)
+        except Exception:
+            pass
+    
+    def _load_ip(self) -> Optional[Tuple[str, float]]:
+        """
+        从数据库读取未过期的API地址
+        
+        Returns:
+            Optional[Tuple[str, float]]: (IP地址, 剩余有效期秒数)，不存在或已过期返回 None
+        """
+        try:
+            meta = get_db().get_meta(_IP_META_KEY)
+        except Exception:
+            return None
+        if not meta:
+            return None
+        ip, expires_at = meta
+        remaining = _IP_TTL if expires_at is None else expires_at - time.time()
+        return ip, remaining
+    
+    def _forget_ip(self):
+        """清除当前地址及数据库中保存的地址，避免之后再次加载不可用的地址"""
+        self.current_ip = None
+        self._ip_expires_at = 0.0
+        try:
+            get_db().delete_meta(_IP_META_KEY)
+        except Exception:
+            pass
+    
     def ensure_ip(self):
-        """确保已获取IP地址"""
-        if not self.current_ip:
-            self.get_optimal_api_ip()
+        """确保已获取未过期的IP地址，优先复用数据库中保存的地址"""
+        if self.current_ip and time.monotonic() < self._ip_expires_at:
+            return
+        loaded = self._load_ip()
+        if loaded:
+            # 有效期从数据库记录的过期时间推算，不因重新加载而延长
+            self.current_ip, remaining = loaded
+            self._ip_expires_at = time.monotonic() + remaining
+            return
+        self.get_optimal_api_ip()
+    
+    def _get(self, path: str, params: Dict) -> "requests.Response":
+        """
+        向当前API地址发起GET请求
+        连接失败或返回5xx时，认为缓存的地址不可用，重新获取最优地址后重试一次
+        
+        Args:
+            path: 接口路径
+            params: 请求参数
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        import requests
+        
+        self.ensure_ip()
+        ip = self.current_ip
+        try:
+            response = self.session.get(f"http://{ip}{path}", params=params, timeout=10)
+            if response.status_code < 500:
+                return response
+        except (requests.ConnectionError, requests.exceptions.RetryError):
+            pass
+        
+        with self._ip_lock:
+            # 并发的另一个请求可能已经切换过地址，此时直接使用新地址重试
+            if self.current_ip == ip:
+                self._forget_ip()
+                self.get_optimal_api_ip()
+        return self.session.get(f"http://{self.current_ip}{path}", params=params, timeout=10)
     
     def get_day_calendar(self, year: int, month: int, day: int) -> Dict:
         """
@@ -59,9 +176,6 @@ class CalendarAPI:
         Returns:
             Dict: 黄历信息
         """
-        self.ensure_ip()
-        
-        url = f"http://{self.current_ip}/api/time/getzdday.php"
         params = {
             "id": self.id,
             "key": self.key,
@@ -71,7 +185,7 @@ class CalendarAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get(_DAY_PATH, params)
             response.raise_for_status()
             data = response.json()
             
@@ -94,9 +208,6 @@ class CalendarAPI:
         Returns:
             Dict: 每个时辰的黄历信息
         """
-        self.ensure_ip()
-        
-        url = f"http://{self.current_ip}/api/time/getzddayh.php"
         params = {
             "id": self.id,
             "key": self.key,
@@ -106,7 +217,7 @@ class CalendarAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get(_HOUR_PATH, params)
             response.raise_for_status()
             data = response.json()
             
@@ -116,3 +227,58 @@ class CalendarAPI:
                 raise Exception(f"获取时辰黄历信息失败: {data}")
         except Exception as e:
             raise Exception(f"获取时辰黄历信息时出错: {str(e)}")
+    
+    def get_both_sync(self, year: int, month: int, day: int) -> Tuple[Dict, Dict]:
+        """
+        并发获取某一天的日维度和小时维度黄历信息，两个请求的网络往返时间相互重叠
+        获取成功后写入数据库缓存
+        
+        Args:
+            year: 年份
+            month: 月份
+            day: 日期
+            
+        Returns:
+            Tuple[Dict, Dict]: (日维度黄历信息, 小时维度黄历信息)
+        """
+        # 先在当前线程确定API地址，避免两个请求同时获取
+        self.ensure_ip()
+        day_future = self._executor.submit(self.get_day_calendar, year, month, day)
+        hour_future = self._executor.submit(self.get_hour_calendar, year, month, day)
+        
+        # 每个结果返回后立即保存，其中一个请求失败时另一个已获取的数据不会丢失
+        date_str = f"{year}-{month:02d}-{day:02d}"
+        db = get_db()
+        savers = {day_future: db.save_day_calendar, hour_future: db.save_hour_calendar}
+        results = {}
+        error = None
+        for future in as_completed(savers):
+            try:
+                results[future] = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            savers[future](date_str, results[future])
+        if error is not None:
+            raise error
+        return results[day_future], results[hour_future]
+
+
+# 单例模式的API客户端实例，进程内复用同一个连接池
+_api_instance: Optional[CalendarAPI] = None
+_api_instance_lock = threading.Lock()
+
+
+def get_calendar_api() -> CalendarAPI:
+    """
+    获取黄历API客户端实例（单例模式）
+    
+    Returns:
+        CalendarAPI: 黄历API客户端实例
+    """
+    global _api_instance
+    if _api_instance is None:
+        with _api_instance_lock:
+            if _api_instance is None:
+                _api_instance = CalendarAPI()
+    return _api_instance
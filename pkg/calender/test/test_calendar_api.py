@@ -0,0 +1,91 @@
+"""
+测试黄历API地址缓存功能
+测试不可用的地址会被清除并重新获取，数据库中保存的地址沿用剩余有效期
+"""
+import time
+
+import pytest
+import requests
+
+from pkg.calender import calendar_api
+from pkg.calender.calendar_api import CalendarAPI, _IP_META_KEY
+from pkg.sqlite.sqlite import SQLiteDB
+
+_BASE_URL = "http://calendar.test/api"
+_BAD_IP = "10.0.0.1"
+_GOOD_IP = "10.0.0.2"
+
+
+class _FakeResponse:
+    """模拟 requests.Response"""
+
+    def __init__(self, data, status_code=200):
+        self._data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._data
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """使用临时数据库替换全局数据库实例"""
+    db = SQLiteDB(str(tmp_path / "calendar.db"))
+    monkeypatch.setattr(calendar_api, "get_db", lambda: db)
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def api(db, monkeypatch):
+    """创建黄历API客户端，测试结束后关闭"""
+    monkeypatch.setenv("CALENDAR_BASE_URL", _BASE_URL)
+    api = CalendarAPI()
+    yield api
+    api.close()
+
+
+class TestCalendarApiIp:
+    """API地址缓存测试类"""
+
+    def test_bad_cached_ip_is_forgotten(self, db, api, monkeypatch):
+        """数据库中的地址连接失败时清除该地址，重新获取最优地址后重试"""
+        db.set_meta(_IP_META_KEY, _BAD_IP, ttl=3600)
+        urls = []
+
+        def fake_get(url, **kwargs):
+            urls.append(url)
+            if url == _BASE_URL:
+                return _FakeResponse({"code": 200, "api": f"http://{_GOOD_IP}/"})
+            if url.startswith(f"http://{_BAD_IP}"):
+                raise requests.ConnectionError("connection refused")
+            return _FakeResponse({"code": 200, "ip": _GOOD_IP})
+
+        monkeypatch.setattr(api.session, "get", fake_get)
+
+        assert api.get_day_calendar(2025, 1, 1) == {"code": 200, "ip": _GOOD_IP}
+        assert urls == [
+            f"http://{_BAD_IP}/api/time/getzdday.php",
+            _BASE_URL,
+            f"http://{_GOOD_IP}/api/time/getzdday.php",
+        ]
+        assert api.current_ip == _GOOD_IP
+        assert db.get_meta(_IP_META_KEY)[0] == _GOOD_IP
+
+    def test_persisted_ip_keeps_remaining_ttl(self, db, api, monkeypatch):
+        """从数据库加载的地址按记录的过期时间计算有效期，不重新获取"""
+        db.set_meta(_IP_META_KEY, _GOOD_IP, ttl=100)
+
+        def fake_get(url, **kwargs):
+            raise AssertionError(f"不应发起请求: {url}")
+
+        monkeypatch.setattr(api.session, "get", fake_get)
+
+        api.ensure_ip()
+        remaining = api._ip_expires_at - time.monotonic()
+        assert api.current_ip == _GOOD_IP
+        assert 90 < remaining <= 100
@@ -1,44 +1,71 @@
-import errno
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
 
 from contextvars import ContextVar
-from functools import wraps
-
-import yaml
+from functools import lru_cache, wraps
 
 TRACE_ID_CTX = ContextVar("trace_id", default="")
 
+_old_record_factory = logging.getLogRecordFactory()
+
+
+def _record_factory(*args, **kwargs):
+    """在创建日志记录时写入 trace_id，未设置时为 system"""
+    record = _old_record_factory(*args, **kwargs)
+    record.trace_id = TRACE_ID_CTX.get() or 'system'
+    return record
+
+
+logging.setLogRecordFactory(_record_factory)
 
-class TraceIDFilter(logging.Filter):
-    def filter(self, record):
-        trace_id = TRACE_ID_CTX.get()
-        if trace_id:
-            record.trace_id = trace_id
-        else:
-            record.trace_id = 'system'
-        return True
 
 def ensure_dir(path):
     """os.path.makedirs without EEXIST."""
-    try:
-        os.makedirs(path)
-    except OSError as e:
-        if e.errno != errno.EEXIST:
-            raise e
+    os.makedirs(path, exist_ok=True)
+
+
+@lru_cache(maxsize=32)
+def _mkdirs(log_dir):
+    """创建日志目录及其下的 error 子目录，同一目录只创建一次"""
+    ensure_dir(os.path.join(log_dir, 'error'))
+
+class _CachedTimeFormatter(logging.Formatter):
+    """同一秒内的日志复用已格式化的时间字符串，只在秒数变化时调用 strftime"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_time = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        seconds = int(record.created)
+        last_seconds, last_str = self._last_time
+        if seconds != last_seconds:
+            last_str = time.strftime(self.default_time_format, self.converter(seconds))
+            self._last_time = (seconds, last_str)
+        return self.default_msec_format % (last_str, record.msecs)
+
 
 def get_logger_by_file(file_path, log_dir='logs/', level=logging.INFO):
     logger_name = os.path.basename(file_path)
-    # 创建 logger 实例
-    logger = logging.getLogger(logger_name)
+    # 创建 logger 实例，名称包含日志目录，不同目录对应不同的 logger
+    logger = logging.getLogger(f"{logger_name}:{os.path.abspath(log_dir)}")
+    # logging.getLogger 对同名 logger 返回同一实例，已配置过则直接返回，避免重复添加 handler
+    # （同一文件和目录下以不同 level 再次调用时沿用首次配置的 level）
+    if logger.handlers:
+        return logger
     logger.setLevel(logging.DEBUG)
-    logger.addFilter(TraceIDFilter())
 
     stdout_file = os.path.join(log_dir, logger_name)
     error_file = os.path.join(log_dir, 'error', logger_name)
-    for file_path in (stdout_file, error_file):
-        ensure_dir(os.path.dirname(file_path))
+    _mkdirs(log_dir)
 
     # 创建 TimedRotatingFileHandler 实例，按天切分滚动
     info_handler = logging.handlers.TimedRotatingFileHandler(
@@ -62,29 +89,43 @@ def get_logger_by_file(file_path, log_dir='logs/', level=logging.INFO):
 
     # 创建 Formatter 实例，设置日志格式
     log_format = "[%(asctime)s] %(filename)s[line:%(lineno)d] : [%(levelname)s] - [trace_id:%(trace_id)s] - %(message)s"
-    formatter = logging.Formatter(log_format)
+    formatter = _CachedTimeFormatter(log_format)
 
     # 将 Formatter 添加到 Handler 中
     info_handler.setFormatter(formatter)
     error_handler.setFormatter(formatter)
 
+    # 文件写入交给后台线程：logger 上只挂 QueueHandler，由 QueueListener 把日志转发给文件 Handler
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    listener = logging.handlers.QueueListener(
+        log_queue, info_handler, error_handler, respect_handler_level=True
+    )
+    listener.start()
+    # 进程退出前停止监听线程，确保队列中的日志全部写入文件
+    atexit.register(listener.stop)
+
     # 将 Handler 添加到 logger 中
-    logger.addHandler(info_handler)
-    logger.addHandler(error_handler)
+    logger.addHandler(queue_handler)
 
     return logger
 
 
 def cached_logger():
-    logger_cache = []
+    # 按调用参数缓存 logger，加锁避免并发首次调用时重复创建 handler
+    logger_cache = {}
+    lock = threading.Lock()
 
     def wrapper(func):
         @wraps(func)
         def inner(*args, **kwargs):
-            if logger_cache:
-                return logger_cache[0]
-            logger = func(*args, **kwargs)
-            logger_cache.append(logger)
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                logger = logger_cache.get(key)
+                if logger is None:
+                    logger = func(*args, **kwargs)
+                    logger_cache[key] = logger
             return logger
 
         return inner
@@ -92,27 +133,24 @@ def cached_logger():
     return wrapper
 
 
+@lru_cache(maxsize=1)
+def _load_cfg():
+    """读取并缓存 configs/app.yaml，优先使用 libyaml 的 C 解析器"""
+    import yaml
+    with open('configs/app.yaml', 'rb') as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _main_file():
+    """获取程序入口文件路径，即调用层级最顶层的文件"""
+    main_module = sys.modules.get('__main__')
+    return getattr(main_module, '__file__', None) or sys.argv[0]
+
+
 @cached_logger()
 def get_logger(log_dir="", level=logging.INFO):
     if log_dir == "":
         # 从configs/app.yaml中获取log_dir
-        with open('configs/app.yaml', 'r') as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
-        log_dir = config['logs']['path']
-    else:
-        pass
-
-    import inspect
-    # 获取调用层级最顶层的信息
-    def get_top_level_caller():
-        frame = inspect.currentframe()
-        while frame.f_back:
-            frame = frame.f_back
-        top_level_frame = frame
-        top_level_info = inspect.getframeinfo(top_level_frame)
-        return top_level_info
-
-    # 调用函数并打印最顶层调用的信息
-    caller_info = get_top_level_caller()
-    file_path = caller_info.filename
-    return get_logger_by_file(file_path, log_dir=log_dir, level=level)
+        log_dir = _load_cfg()['logs']['path']
+
+    return get_logger_by_file(_main_file(), log_dir=log_dir, level=level)
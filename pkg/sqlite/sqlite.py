@@ -2,14 +2,22 @@
 SQLite数据库操作模块
 用于缓存黄历信息，避免重复调用API
 """
+import atexit
 import sqlite3
-import json
 import os
 import errno
+import gzip
+import queue
+import threading
+import time
 from contextlib import contextmanager
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
 from datetime import datetime
 
+import orjson
+
+from pkg.cache.cache import TTLCache
+
 
 def _get_logger():
     """延迟获取logger，避免模块导入时的错误"""
@@ -41,20 +49,114 @@ def get_local_timestamp() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+# 黄历数据以 gzip 压缩后的 orjson 字节存储，level=1 压缩速度最快，重复的中文文本仍能显著压缩
+_COMPRESS_LEVEL = 1
+
+
+def _encode_data(data: Dict) -> bytes:
+    """
+    将黄历数据序列化并压缩为写入 data 列的字节串
+    
+    Args:
+        data: 黄历数据字典
+        
+    Returns:
+        bytes: gzip 压缩后的 JSON 字节串
+    """
+    return gzip.compress(orjson.dumps(data), compresslevel=_COMPRESS_LEVEL)
+
+
+def _decode_data(value) -> Optional[Dict]:
+    """
+    解析 data 列的值，兼容旧版本以 TEXT 存储的 JSON 字符串
+    
+    Args:
+        value: data 列的值（bytes 或 str）
+        
+    Returns:
+        Optional[Dict]: 黄历数据字典，值为空时返回 None
+    """
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        value = gzip.decompress(value)
+    return orjson.loads(value)
+
+
+# 每个新连接执行的PRAGMA（journal_mode=WAL 是数据库文件级别的设置，只需在初始化时执行一次）
+_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+"""
+
+
+# SQL语句常量：文本固定，sqlite3会在每个连接的语句缓存中复用预编译结果
+_SQL_GET_DAY = "SELECT data FROM day_calendar WHERE date = ?"
+_SQL_GET_HOUR = "SELECT data FROM hour_calendar WHERE date = ?"
+_SQL_GET_BUNDLE = """SELECT (SELECT data FROM day_calendar WHERE date = ?) AS day_data,
+                            (SELECT data FROM hour_calendar WHERE date = ?) AS hour_data"""
+
+# 使用 INSERT ... ON CONFLICT 语法，更新时保留 create_time，只更新 update_time
+# 时间由SQLite生成本地时间（列默认值 CURRENT_TIMESTAMP 为UTC时间，与已有数据不一致，因此显式指定）
+_SQL_UPSERT_DAY = """INSERT INTO day_calendar (date, data, create_time, update_time)
+                     VALUES (?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))
+                     ON CONFLICT(date) DO UPDATE SET
+                         data = excluded.data,
+                         update_time = excluded.update_time"""
+_SQL_UPSERT_HOUR = """INSERT INTO hour_calendar (date, data, create_time, update_time)
+                      VALUES (?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))
+                      ON CONFLICT(date) DO UPDATE SET
+                          data = excluded.data,
+                          update_time = excluded.update_time"""
+# 写入时先尝试更新，按是否有返回行（或影响行数）判断记录是否已存在，不存在再插入，无需预先查询
+# 时间精确到秒，同一秒内新增后再更新的记录 create_time 与 update_time 相同，不能据此区分新增和更新
+_SQL_RETURNING = " RETURNING update_time"
+_SQL_UPDATE_DAY = "UPDATE day_calendar SET data = ?, update_time = datetime('now', 'localtime') WHERE date = ?"
+_SQL_UPDATE_HOUR = "UPDATE hour_calendar SET data = ?, update_time = datetime('now', 'localtime') WHERE date = ?"
+
+_SQL_GET_META = "SELECT v, expires_at FROM meta WHERE k = ?"
+_SQL_DELETE_META = "DELETE FROM meta WHERE k = ?"
+_SQL_SET_META = """INSERT INTO meta (k, v, expires_at) VALUES (?, ?, ?)
+                   ON CONFLICT(k) DO UPDATE SET v = excluded.v, expires_at = excluded.expires_at"""
+
+# 进程内黄历缓存的容量和过期时间（秒）
+_CACHE_MAXSIZE = 1024
+_CACHE_TTL = 3600
+
+# RETURNING 子句需要 SQLite 3.35.0 及以上版本
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
 class SQLiteDB:
-    """SQLite数据库操作类"""
+    """
+    SQLite数据库操作类
+    连接在进程内复用：一个写连接（由锁保证串行写入）加一个读连接池，WAL模式下读写互不阻塞
+    """
     
-    def __init__(self, db_path: str = "data/calendar.db"):
+    def __init__(self, db_path: str = "data/calendar.db", pool_size: Optional[int] = None):
         """
         初始化数据库连接
         
         Args:
             db_path: 数据库文件路径，默认为 data/calendar.db
+            pool_size: 读连接池大小，默认为 max(4, CPU核数)
         """
         self.db_path = db_path
         self.logger = _get_logger()
+        self._pool_size = pool_size or max(4, os.cpu_count() or 1)
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=self._pool_size)
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        # 热点日期的查询结果缓存在进程内，命中时无需访问数据库和反序列化
+        self._day_cache = TTLCache(maxsize=_CACHE_MAXSIZE, ttl=_CACHE_TTL)
+        self._hour_cache = TTLCache(maxsize=_CACHE_MAXSIZE, ttl=_CACHE_TTL)
         self._ensure_db_dir()
         self._init_connection()
+        atexit.register(self.close)
         self._init_tables()
         self.logger.info(f"SQLite数据库初始化完成: {self.db_path}")
     
@@ -70,39 +172,91 @@ class SQLiteDB:
         测试连接是否正常
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute("SELECT 1")
-            conn.close()
+            self._writer = self._connect()
+            self._writer.execute("PRAGMA journal_mode=WAL")
+            self._writer.execute("SELECT 1")
             self.logger.debug("数据库连接测试成功")
         except Exception as e:
             self.logger.error(f"数据库连接初始化失败: {str(e)}")
             raise
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        创建一个新的数据库连接
+        
+        Returns:
+            sqlite3.Connection: 数据库连接对象（自动提交模式，事务由get_connection显式管理）
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row  # 使查询结果可以通过列名访问
+        conn.executescript(_CONNECTION_PRAGMAS)
+        return conn
+    
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """从读连接池取出一个连接，池未满时按需创建，否则等待其他线程归还"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if self._reader_count < self._pool_size:
+                conn = self._connect()
+                self._reader_count += 1
+                return conn
+        return self._readers.get()
+    
     @contextmanager
-    def get_connection(self):
+    def get_connection(self, write: bool = False):
         """
         获取数据库连接的上下文管理器
-        自动处理事务提交和回滚
+        写操作使用唯一的写连接并自动处理事务提交和回滚，读操作从读连接池借出连接
+        
+        Args:
+            write: 是否为写操作
         
         Yields:
             sqlite3.Connection: 数据库连接对象
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # 使查询结果可以通过列名访问
+        if write:
+            with self._write_lock:
+                conn = self._writer
+                conn.execute("BEGIN")
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    _get_logger().error(f"数据库操作失败: {str(e)}")
+                    raise
+            return
+        
+        conn = self._acquire_reader()
         try:
             yield conn
-            conn.commit()
         except Exception as e:
-            conn.rollback()
             _get_logger().error(f"数据库操作失败: {str(e)}")
             raise
         finally:
-            conn.close()
+            self._readers.put(conn)
+    
+    def close(self):
+        """关闭所有数据库连接"""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._pool_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._reader_count = 0
     
     def _init_tables(self):
         """初始化数据库表结构"""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(write=True) as conn:
                 cursor = conn.cursor()
                 
                 # 创建日维度黄历信息表
@@ -110,7 +264,7 @@ class SQLiteDB:
                     CREATE TABLE IF NOT EXISTS day_calendar (
                     id INTEGER PRIMARY KEY AUTOINCREMENT, -- id 主键自增
                     date TEXT UNIQUE NOT NULL,             -- date 日期格式，唯一键，不允许为空
-                    data TEXT,                             -- data 数据 json格式 (SQLite 没有原生JSON类型，通常用TEXT存储)
+                    data BLOB,                             -- data 数据 gzip压缩的json (旧版本以TEXT存储的json读取时兼容)
                     create_time TEXT DEFAULT CURRENT_TIMESTAMP NOT NULL, -- create_time 默认当前时间，不允许为空
                     update_time TEXT DEFAULT CURRENT_TIMESTAMP NOT NULL  -- update_time 最后更新时间，默认当前时间，不允许为空
                     )
@@ -121,22 +275,25 @@ class SQLiteDB:
                     CREATE TABLE IF NOT EXISTS hour_calendar (
                     id INTEGER PRIMARY KEY AUTOINCREMENT, -- id 主键自增
                     date TEXT UNIQUE NOT NULL,             -- date 日期格式，唯一键，不允许为空
-                    data TEXT,                             -- data 数据 json格式 (SQLite 没有原生JSON类型，通常用TEXT存储)
+                    data BLOB,                             -- data 数据 gzip压缩的json (旧版本以TEXT存储的json读取时兼容)
                     create_time TEXT DEFAULT CURRENT_TIMESTAMP NOT NULL, -- create_time 默认当前时间，不允许为空
                     update_time TEXT DEFAULT CURRENT_TIMESTAMP NOT NULL  -- update_time 最后更新时间，默认当前时间，不允许为空
                     )
                 """)
                 
-                # 创建唯一索引以提高查询性能并确保数据唯一性
+                # 创建键值元信息表，expires_at 为过期时间的 Unix 时间戳，为空表示永不过期
                 cursor.execute("""
-                    CREATE UNIQUE INDEX IF NOT EXISTS idx_day_calendar_date 
-                    ON day_calendar(date)
+                    CREATE TABLE IF NOT EXISTS meta (
+                    k TEXT PRIMARY KEY,                    -- k 键
+                    v TEXT,                                -- v 值
+                    expires_at REAL                        -- expires_at 过期时间
+                    )
                 """)
                 
-                cursor.execute("""
-                    CREATE UNIQUE INDEX IF NOT EXISTS idx_hour_calendar_date 
-                    ON hour_calendar(date) 
-                """)
+                # date 列声明为 UNIQUE，SQLite 已自动为其创建唯一索引
+                # 删除旧版本额外创建的重复索引，避免每次写入维护两棵相同的B树
+                cursor.execute("DROP INDEX IF EXISTS idx_day_calendar_date")
+                cursor.execute("DROP INDEX IF EXISTS idx_hour_calendar_date")
                 
                 conn.commit()
                 self.logger.debug("数据库表结构初始化完成")
@@ -161,6 +318,125 @@ class SQLiteDB:
             self.logger.error(f"数据库连接测试失败: {str(e)}")
             return False
     
+    def get_meta(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """
+        获取元信息
+        
+        Args:
+            key: 键
+            
+        Returns:
+            Optional[Tuple[str, Optional[float]]]: 未过期时返回 (值, 过期时间的Unix时间戳)，
+                永不过期时过期时间为 None；不存在或已过期返回 None
+        """
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(_SQL_GET_META, (key,)).fetchone()
+            if row is None:
+                return None
+            if row["expires_at"] is not None and row["expires_at"] < time.time():
+                return None
+            return row["v"], row["expires_at"]
+        except Exception as e:
+            self.logger.error(f"查询元信息失败: {str(e)}")
+            return None
+    
+    def set_meta(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        """
+        保存元信息
+        
+        Args:
+            key: 键
+            value: 值
+            ttl: 过期时间（秒），为空表示永不过期
+            
+        Returns:
+            bool: 保存是否成功
+        """
+        try:
+            expires_at = time.time() + ttl if ttl is not None else None
+            with self.get_connection(write=True) as conn:
+                conn.execute(_SQL_SET_META, (key, value, expires_at))
+            return True
+        except Exception as e:
+            self.logger.error(f"保存元信息失败: {str(e)}")
+            return False
+    
+    def delete_meta(self, key: str) -> bool:
+        """
+        删除元信息
+        
+        Args:
+            key: 键
+            
+        Returns:
+            bool: 删除是否成功
+        """
+        try:
+            with self.get_connection(write=True) as conn:
+                conn.execute(_SQL_DELETE_META, (key,))
+            return True
+        except Exception as e:
+            self.logger.error(f"删除元信息失败: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, upsert_sql: str, update_sql: str, params: Tuple) -> Tuple[bool, str]:
+        """
+        写入一条黄历记录，已存在则更新，不额外执行查询
+        
+        Args:
+            conn: 写连接
+            upsert_sql: INSERT ... ON CONFLICT 语句
+            update_sql: UPDATE 语句
+            params: (date, data)
+            
+        Returns:
+            Tuple[bool, str]: (是否为新增, 更新时间)
+        """
+        date, data = params
+        if _SUPPORTS_RETURNING:
+            rows = conn.execute(update_sql + _SQL_RETURNING, (data, date)).fetchall()
+            if rows:
+                return False, rows[0]["update_time"]
+            row = conn.execute(upsert_sql + _SQL_RETURNING, params).fetchall()[0]
+            return True, row["update_time"]
+        if conn.execute(update_sql, (data, date)).rowcount:
+            return False, get_local_timestamp()
+        conn.execute(upsert_sql, params)
+        return True, get_local_timestamp()
+    
+    def get_calendar_bundle(self, date: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        一次查询同时获取日维度和小时维度黄历信息
+        
+        Args:
+            date: 日期字符串，格式为 YYYY-MM-DD
+            
+        Returns:
+            Tuple[Optional[Dict], Optional[Dict]]: (日维度数据, 小时维度数据)，不存在的部分为 None
+        """
+        day_info = self._day_cache.get(date)
+        hour_info = self._hour_cache.get(date)
+        if day_info is not None and hour_info is not None:
+            return day_info, hour_info
+        
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(_SQL_GET_BUNDLE, (date, date)).fetchone()
+                day_raw = row["day_data"]
+                hour_raw = row["hour_data"]
+            if day_info is None and day_raw:
+                day_info = _decode_data(day_raw)
+                self._day_cache.set(date, day_info)
+            if hour_info is None and hour_raw:
+                hour_info = _decode_data(hour_raw)
+                self._hour_cache.set(date, hour_info)
+            return day_info, hour_info
+        except Exception as e:
+            self.logger.error(f"查询黄历信息失败: {str(e)}")
+            return None, None
+    
     def get_day_calendar(self, date: str) -> Optional[Dict]:
         """
         从数据库获取日维度黄历信息
@@ -171,18 +447,18 @@ class SQLiteDB:
         Returns:
             Optional[Dict]: 如果存在则返回数据字典，否则返回 None
         """
+        cached = self._day_cache.get(date)
+        if cached is not None:
+            return cached
+        
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data FROM day_calendar WHERE date = ?",
-                    (date,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    data_str = row["data"]
-                    return json.loads(data_str) if data_str else None
-                return None
+                row = conn.execute(_SQL_GET_DAY, (date,)).fetchone()
+            if row and row["data"]:
+                data = _decode_data(row["data"])
+                self._day_cache.set(date, data)
+                return data
+            return None
         except Exception as e:
             self.logger.error(f"查询日维度黄历信息失败: {str(e)}")
             return None
@@ -199,36 +475,54 @@ class SQLiteDB:
             bool: 保存是否成功
         """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 检查记录是否已存在
-                cursor.execute("SELECT update_time FROM day_calendar WHERE date = ?", (date,))
-                existing_row = cursor.fetchone()
-                old_update_time = existing_row["update_time"] if existing_row else None
-                
-                data_str = json.dumps(data, ensure_ascii=False)
-                current_time = get_local_timestamp()
-                
-                # 使用 INSERT ... ON CONFLICT 语法，更新时保留 create_time，只更新 update_time
-                cursor.execute(
-                    """INSERT INTO day_calendar (date, data, create_time, update_time) 
-                       VALUES (?, ?, ?, ?)
-                       ON CONFLICT(date) DO UPDATE SET 
-                           data = excluded.data,
-                           update_time = excluded.update_time""",
-                    (date, data_str, current_time, current_time)
+            data_blob = _encode_data(data)
+            
+            with self.get_connection(write=True) as conn:
+                inserted, current_time = self._upsert(
+                    conn, _SQL_UPSERT_DAY, _SQL_UPDATE_DAY, (date, data_blob)
                 )
                 
-                if old_update_time:
-                    self.logger.info(f"更新日维度黄历信息: {date}, 旧时间: {old_update_time}, 新时间: {current_time}")
-                else:
+                if inserted:
                     self.logger.info(f"新增日维度黄历信息: {date}, 时间: {current_time}")
-                return True
+                else:
+                    self.logger.info(f"更新日维度黄历信息: {date}, 时间: {current_time}")
+            
+            # 事务提交后再写入进程内缓存，保证缓存与数据库一致
+            self._day_cache.set(date, data)
+            return True
         except Exception as e:
             self.logger.error(f"保存日维度黄历信息失败: {str(e)}")
             return False
     
+    def save_day_calendar_many(self, items: Iterable[Tuple[str, Dict]]) -> bool:
+        """
+        批量保存日维度黄历信息到数据库，所有记录在同一个事务中写入
+        
+        按日期范围回填时，建议调用方先累积数据，每 500 条调用一次本方法，
+        避免单个事务过大
+        
+        Args:
+            items: (日期字符串, 黄历数据字典) 的可迭代对象，日期格式为 YYYY-MM-DD
+            
+        Returns:
+            bool: 保存是否成功
+        """
+        try:
+            rows = [(date, _encode_data(data)) for date, data in items]
+            if not rows:
+                return True
+            
+            with self.get_connection(write=True) as conn:
+                conn.executemany(_SQL_UPSERT_DAY, rows)
+            for row in rows:
+                self._day_cache.pop(row[0])
+            
+            self.logger.info(f"批量保存日维度黄历信息: {len(rows)} 条")
+            return True
+        except Exception as e:
+            self.logger.error(f"批量保存日维度黄历信息失败: {str(e)}")
+            return False
+    
     def get_hour_calendar(self, date: str) -> Optional[Dict]:
         """
         从数据库获取小时维度黄历信息
@@ -239,18 +533,18 @@ class SQLiteDB:
         Returns:
             Optional[Dict]: 如果存在则返回数据字典，否则返回 None
         """
+        cached = self._hour_cache.get(date)
+        if cached is not None:
+            return cached
+        
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data FROM hour_calendar WHERE date = ?",
-                    (date,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    data_str = row["data"]
-                    return json.loads(data_str) if data_str else None
-                return None
+                row = conn.execute(_SQL_GET_HOUR, (date,)).fetchone()
+            if row and row["data"]:
+                data = _decode_data(row["data"])
+                self._hour_cache.set(date, data)
+                return data
+            return None
         except Exception as e:
             self.logger.error(f"查询小时维度黄历信息失败: {str(e)}")
             return None
@@ -267,39 +561,58 @@ class SQLiteDB:
             bool: 保存是否成功
         """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 检查记录是否已存在
-                cursor.execute("SELECT update_time FROM hour_calendar WHERE date = ?", (date,))
-                existing_row = cursor.fetchone()
-                old_update_time = existing_row["update_time"] if existing_row else None
-                
-                data_str = json.dumps(data, ensure_ascii=False)
-                current_time = get_local_timestamp()
-                
-                # 使用 INSERT ... ON CONFLICT 语法，更新时保留 create_time，只更新 update_time
-                cursor.execute(
-                    """INSERT INTO hour_calendar (date, data, create_time, update_time) 
-                       VALUES (?, ?, ?, ?)
-                       ON CONFLICT(date) DO UPDATE SET 
-                           data = excluded.data,
-                           update_time = excluded.update_time""",
-                    (date, data_str, current_time, current_time)
+            data_blob = _encode_data(data)
+            
+            with self.get_connection(write=True) as conn:
+                inserted, current_time = self._upsert(
+                    conn, _SQL_UPSERT_HOUR, _SQL_UPDATE_HOUR, (date, data_blob)
                 )
                 
-                if old_update_time:
-                    self.logger.info(f"更新小时维度黄历信息: {date}, 旧时间: {old_update_time}, 新时间: {current_time}")
-                else:
+                if inserted:
                     self.logger.info(f"新增小时维度黄历信息: {date}, 时间: {current_time}")
-                return True
+                else:
+                    self.logger.info(f"更新小时维度黄历信息: {date}, 时间: {current_time}")
+            
+            # 事务提交后再写入进程内缓存，保证缓存与数据库一致
+            self._hour_cache.set(date, data)
+            return True
         except Exception as e:
             self.logger.error(f"保存小时维度黄历信息失败: {str(e)}")
             return False
+    
+    def save_hour_calendar_many(self, items: Iterable[Tuple[str, Dict]]) -> bool:
+        """
+        批量保存小时维度黄历信息到数据库，所有记录在同一个事务中写入
+        
+        按日期范围回填时，建议调用方先累积数据，每 500 条调用一次本方法，
+        避免单个事务过大
+        
+        Args:
+            items: (日期字符串, 黄历数据字典) 的可迭代对象，日期格式为 YYYY-MM-DD
+            
+        Returns:
+            bool: 保存是否成功
+        """
+        try:
+            rows = [(date, _encode_data(data)) for date, data in items]
+            if not rows:
+                return True
+            
+            with self.get_connection(write=True) as conn:
+                conn.executemany(_SQL_UPSERT_HOUR, rows)
+            for row in rows:
+                self._hour_cache.pop(row[0])
+            
+            self.logger.info(f"批量保存小时维度黄历信息: {len(rows)} 条")
+            return True
+        except Exception as e:
+            self.logger.error(f"批量保存小时维度黄历信息失败: {str(e)}")
+            return False
 
 
 # 单例模式的数据库实例
 _db_instance: Optional[SQLiteDB] = None
+_db_instance_lock = threading.Lock()
 
 
 def get_db(db_path: str = "data/calendar.db") -> SQLiteDB:
@@ -314,7 +627,9 @@ def get_db(db_path: str = "data/calendar.db") -> SQLiteDB:
     """
     global _db_instance
     if _db_instance is None:
-        _db_instance = SQLiteDB(db_path)
+        with _db_instance_lock:
+            if _db_instance is None:
+                _db_instance = SQLiteDB(db_path)
     return _db_instance
 
 
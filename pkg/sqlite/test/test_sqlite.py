@@ -0,0 +1,50 @@
+"""
+测试SQLite数据库读写功能
+测试旧版本TEXT格式数据的读取，以及不支持RETURNING时新增和更新的判断
+"""
+import json
+
+import pytest
+
+from pkg.sqlite import sqlite
+from pkg.sqlite.sqlite import SQLiteDB, _SQL_UPDATE_DAY, _SQL_UPSERT_DAY, _encode_data
+
+
+@pytest.fixture
+def db(tmp_path):
+    """创建临时数据库，测试结束后关闭"""
+    db = SQLiteDB(str(tmp_path / "calendar.db"))
+    yield db
+    db.close()
+
+
+class TestSQLiteDB:
+    """数据库读写测试类"""
+
+    def test_legacy_text_row(self, db):
+        """旧版本以TEXT存储的json数据可以正常读取"""
+        data = {"code": 200, "yi": "嫁娶 出行"}
+        with db.get_connection(write=True) as conn:
+            conn.execute(
+                "INSERT INTO day_calendar (date, data) VALUES (?, ?)",
+                ("2025-01-01", json.dumps(data, ensure_ascii=False)),
+            )
+
+        assert db.get_day_calendar("2025-01-01") == data
+        assert db.get_calendar_bundle("2025-01-01") == (data, None)
+
+    @pytest.mark.parametrize("supports_returning", [False, sqlite._SUPPORTS_RETURNING])
+    def test_upsert_reports_insert_or_update(self, db, monkeypatch, supports_returning):
+        """首次写入返回新增，再次写入同一日期返回更新"""
+        monkeypatch.setattr(sqlite, "_SUPPORTS_RETURNING", supports_returning)
+
+        with db.get_connection(write=True) as conn:
+            inserted, _ = db._upsert(conn, _SQL_UPSERT_DAY, _SQL_UPDATE_DAY, ("2025-01-01", _encode_data({"v": 1})))
+        assert inserted is True
+
+        with db.get_connection(write=True) as conn:
+            inserted, _ = db._upsert(conn, _SQL_UPSERT_DAY, _SQL_UPDATE_DAY, ("2025-01-01", _encode_data({"v": 2})))
+            count = conn.execute("SELECT COUNT(*) FROM day_calendar").fetchone()[0]
+        assert inserted is False
+        assert count == 1
+        assert db.get_day_calendar("2025-01-01") == {"v": 2}